@@ -10,10 +10,13 @@ from calculators import (
 )
 from simulations import monte_carlo_retirement
 from transactions import (
-    load_transactions,
+    detect_recurring_payments,
+    drop_duplicate_transactions,
+    load_many_transactions,
     monthly_summary,
     category_summary,
     income_expense_summary,
+    recurring_monthly_total,
 )
 
 
@@ -52,7 +55,7 @@ def show_cashflow_module():
         fixed_expenses = st.number_input(
             "Gastos fijos (€)",
             min_value=0.0,
-            value=900.0,
+            value=st.session_state.get("detected_fixed_expenses", 900.0),
             step=50.0,
             help="Alquiler/hipoteca, suministros básicos, seguros..."
         )
@@ -129,7 +132,7 @@ def show_emergency_module():
         fixed_expenses = st.number_input(
             "Gastos fijos mensuales (€)",
             min_value=0.0,
-            value=900.0,
+            value=st.session_state.get("detected_fixed_expenses", 900.0),
             step=50.0,
             key="fixed_emergency",
         )
@@ -366,31 +369,72 @@ def show_transactions_module():
     st.subheader("📂 Análisis de transacciones reales (CSV)")
 
     st.markdown(
-        "Sube un archivo **CSV** con tus movimientos bancarios o una exportación de gastos. "
-        "La aplicación intentará detectar automáticamente las columnas de fecha, importe, descripción y categoría. "
+        "Sube uno o varios archivos **CSV** con tus movimientos bancarios o exportaciones de gastos "
+        "(por ejemplo, un archivo por cuenta y mes). "
+        "La aplicación intentará detectar automáticamente las columnas de fecha, importe, descripción y categoría, "
+        "y eliminará los movimientos repetidos entre exportaciones que se solapen. "
         "Formato recomendado: `date, description, amount, category`."
     )
 
-    uploaded_file = st.file_uploader(
-        "Sube tu archivo CSV",
+    uploaded_files = st.file_uploader(
+        "Sube tus archivos CSV",
         type=["csv"],
-        help="Por seguridad, el archivo solo se procesa en tu navegador / sesión actual.",
+        accept_multiple_files=True,
+        help="Por seguridad, los archivos solo se procesan en tu navegador / sesión actual.",
     )
 
-    if not uploaded_file:
+    if not uploaded_files:
         st.info("Aún no has subido ningún archivo. Prueba con un CSV de ejemplo de tus gastos.")
         return
 
+    with st.expander("Cuenta de cada archivo"):
+        st.caption(
+            "Por defecto cada archivo se asigna a una cuenta con su mismo nombre. "
+            "Si varios archivos son exportaciones de la misma cuenta, ponles el mismo nombre: "
+            "los movimientos repetidos solo se eliminan entre archivos de la misma cuenta."
+        )
+        accounts = [
+            st.text_input(
+                f"Cuenta de «{f.name}»",
+                value=f.name.rsplit(".", 1)[0],
+                key=f"account_{i}_{f.name}",
+            ).strip()
+            or f.name
+            for i, f in enumerate(uploaded_files)
+        ]
+
     try:
-        df = load_transactions(uploaded_file)
+        all_rows, rejected = load_many_transactions(
+            uploaded_files, accounts=accounts, deduplicate=False, return_rejected=True
+        )
     except Exception as e:
         st.error(
-            "No se ha podido leer el archivo. Revisa que tenga al menos columnas de **fecha** e **importe**.\n\n"
+            "No se ha podido leer algún archivo. Revisa que tenga al menos columnas de **fecha** e **importe**.\n\n"
             f"Detalle técnico: {e}"
         )
         return
 
-    st.success(f"Archivo cargado correctamente. Filas: {len(df)}")
+    df = drop_duplicate_transactions(all_rows, by_account=True)
+    duplicates = len(all_rows) - len(df)
+
+    st.success(
+        f"Archivos cargados correctamente: {len(uploaded_files)}. Filas: {len(df)}"
+    )
+    if duplicates:
+        st.info(f"Se han eliminado **{duplicates} movimientos duplicados** entre archivos.")
+    if len(rejected):
+        st.warning(
+            f"Se han descartado **{len(rejected)} filas** cuyo importe no se ha podido interpretar."
+        )
+        with st.expander("Ver filas descartadas"):
+            st.dataframe(rejected)
+    if df["account"].nunique() > 1:
+        with st.expander("Ver movimientos por cuenta"):
+            st.dataframe(
+                df.groupby("account")["amount"]
+                .agg(["count", "sum"])
+                .rename(columns={"count": "Movimientos", "sum": "Saldo neto"})
+            )
     with st.expander("Ver primeras filas del archivo"):
         st.dataframe(df.head(20))
 
@@ -424,6 +468,24 @@ def show_transactions_module():
     )
     st.plotly_chart(fig_cat, use_container_width=True)
 
+    st.subheader("Pagos periódicos detectados")
+    recurring = detect_recurring_payments(df)
+
+    if recurring.empty:
+        st.info(
+            "No se han detectado pagos periódicos (alquiler, suscripciones, suministros...). "
+            "Suelen hacer falta al menos tres meses de movimientos."
+        )
+        return
+
+    st.dataframe(recurring)
+    recurring_total = recurring_monthly_total(recurring)
+    st.metric("Gastos fijos mensuales estimados", f"{recurring_total:,.2f} €")
+
+    if st.button("Usar como gastos fijos en Resumen financiero y Fondo de emergencia"):
+        st.session_state["detected_fixed_expenses"] = round(recurring_total, 2)
+        st.success("Listo: los módulos de resumen y fondo de emergencia usarán este importe como gastos fijos.")
+
 
 # --- ROUTER DE MÓDULOS ------------------------------------------------------
 if module == "Resumen financiero":
@@ -1,13 +1,263 @@
+import csv
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
 
-def load_transactions(file) -> pd.DataFrame:
+# Caracteres que se admiten alrededor de un importe: espacios (incluidos los
+# no separables) y símbolos de moneda habituales. Dentro de la cifra solo se
+# admite el espacio, como separador de miles ("1 234,56").
+_SPACE_CODES = np.array([ord(" "), 0x00A0, 0x202F, ord("\t")], dtype=np.uint32)
+_CURRENCY_CODES = np.array([ord("€"), ord("$"), ord("£")], dtype=np.uint32)
+_MINUS_CODES = np.array([ord("-"), 0x2212], dtype=np.uint32)
+_MAX_DIGITS = 18  # cifras que caben en un int64 (hasta 10**18 - 1), ya en céntimos
+# Longitud máxima de un importe; los textos más largos se rechazan sin
+# construir la matriz de caracteres, cuyo ancho es el de la celda más larga.
+_MAX_LENGTH = _MAX_DIGITS + 12
+_CHUNK_ROWS = 100_000
+
+
+def _too_long(values: pd.Series) -> np.ndarray:
+    """
+    Marca los textos que superan _MAX_LENGTH caracteres.
+    """
+    return (values.str.len().fillna(0) > _MAX_LENGTH).to_numpy()
+
+
+def _codepoints(values: pd.Series) -> np.ndarray:
+    """
+    Convierte una serie de textos en una matriz (filas x caracteres) de
+    códigos Unicode, rellenada con ceros por la derecha. Los textos
+    demasiado largos se sustituyen por cadenas vacías.
+    """
+    arr = np.asarray(values.fillna("").mask(_too_long(values), ""), dtype=np.str_)
+    width = arr.dtype.itemsize // 4
+    return arr.view(np.uint32).reshape(len(arr), width)
+
+
+def detect_number_format(values: pd.Series, sample_size: int = 1000):
+    """
+    Detecta el separador decimal y el de miles a partir de una muestra de importes.
+    Devuelve (decimal, miles), por ejemplo (",", ".") para "1.234,56 €".
+    Si la muestra no es concluyente se asume el formato español.
+    """
+    sample = values.dropna()
+    sample = sample.loc[~_too_long(sample)]
+    if len(sample) > sample_size:
+        sample = sample.iloc[:: len(sample) // sample_size]
+
+    codes = _codepoints(sample)
+    if codes.size == 0:
+        return ",", "."
+
+    is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+    digits_right = is_digit.sum(axis=1)[:, None] - is_digit.cumsum(axis=1)
+    rows = np.arange(len(codes))
+    width = codes.shape[1]
+
+    def separator_stats(char):
+        is_sep = codes == ord(char)
+        count = is_sep.sum(axis=1)
+        last = width - 1 - is_sep[:, ::-1].argmax(axis=1)
+        return count, last, digits_right[rows, last]
+
+    n_dot, last_dot, after_dot = separator_stats(".")
+    n_comma, last_comma, after_comma = separator_stats(",")
+
+    both = (n_dot > 0) & (n_comma > 0)
+    only_dot = (n_dot > 0) & (n_comma == 0)
+    only_comma = (n_comma > 0) & (n_dot == 0)
+
+    # Con ambos separadores, el último es el decimal. Con uno solo, es decimal
+    # si aparece una vez y no va seguido de exactamente tres cifras, y de miles
+    # si se repite. "1.234" o "1,234" por sí solos son ambiguos y no votan.
+    comma_votes = (
+        (both & (last_comma > last_dot)).sum()
+        + (only_comma & (n_comma == 1) & (after_comma != 3)).sum()
+        + (only_dot & (n_dot > 1)).sum()
+    )
+    dot_votes = (
+        (both & (last_dot > last_comma)).sum()
+        + (only_dot & (n_dot == 1) & (after_dot != 3)).sum()
+        + (only_comma & (n_comma > 1)).sum()
+    )
+
+    if dot_votes > comma_votes:
+        return ".", ","
+    return ",", "."
+
+
+def _parse_cents_block(codes: np.ndarray, decimal: str, thousands: str):
+    """
+    Interpreta un bloque de la matriz de códigos como importes en céntimos.
+    Devuelve (céntimos, válidos) como arrays de numpy.
+    """
+    n = len(codes)
+    rows = np.arange(n)
+
+    is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+    is_dec = codes == ord(decimal)
+    is_th = codes == ord(thousands)
+    is_minus = np.isin(codes, _MINUS_CODES)
+    is_plus = codes == ord("+")
+    is_lpar = codes == ord("(")
+    is_rpar = codes == ord(")")
+    is_padding = codes == 0
+    is_space = np.isin(codes, _SPACE_CODES)
+    # Símbolos de moneda y letras mayúsculas para códigos tipo "EUR" o "USD".
+    is_symbol = np.isin(codes, _CURRENCY_CODES) | ((codes >= ord("A")) & (codes <= ord("Z")))
+
+    positions = np.arange(codes.shape[1])
+    first_digit = is_digit.argmax(axis=1)
+    last_digit = codes.shape[1] - 1 - is_digit[:, ::-1].argmax(axis=1)
+    before = positions < first_digit[:, None]
+    after = positions > last_digit[:, None]
+    outside = before | after
+
+    # Un espacio entre cifras solo puede ser separador de miles.
+    is_th |= is_space & ~outside
+    known = (
+        is_digit | is_dec | is_th | is_minus | is_plus | is_lpar | is_rpar
+        | is_padding | is_space | is_symbol
+    )
+
+    n_digits = is_digit.sum(axis=1)
+    digits_right = n_digits[:, None] - is_digit.cumsum(axis=1)
+
+    n_dec = is_dec.sum(axis=1)
+    frac = np.where(n_dec == 1, digits_right[rows, is_dec.argmax(axis=1)], 0)
+
+    # Los separadores de miles deben ir antes del decimal, en grupos de tres
+    # cifras y con entre una y tres cifras delante del primero.
+    n_th = is_th.sum(axis=1)
+    th_group = np.where(is_th, digits_right - frac[:, None], 0)
+    th_span = th_group.max(axis=1)
+    int_digits = n_digits - frac
+    th_ok = (n_th == 0) | (
+        ~(is_th & (digits_right < frac[:, None])).any(axis=1)
+        & ~(is_th & (th_group % 3 != 0)).any(axis=1)
+        & (th_span == 3 * n_th)
+        & (int_digits - th_span >= 1)
+        & (int_digits - th_span <= 3)
+    )
+
+    # Los signos van delante de la primera cifra ("-12", "(12)"); el paréntesis
+    # de cierre y el signo menos final ("12,50-") van detrás de la última.
+    # Los símbolos de moneda, a uno u otro lado.
+    n_minus = is_minus.sum(axis=1)
+    n_lpar = is_lpar.sum(axis=1)
+    signs_ok = (
+        ~((is_plus | is_lpar) & ~before).any(axis=1)
+        & ~(is_rpar & ~after).any(axis=1)
+        & ~((is_minus | is_symbol) & ~outside).any(axis=1)
+    )
+
+    valid = (
+        known.all(axis=1)
+        & (n_digits > 0)
+        & (n_digits <= _MAX_DIGITS)
+        & (int_digits + 2 <= _MAX_DIGITS)
+        & (n_dec <= 1)
+        & th_ok
+        & (n_minus + is_plus.sum(axis=1) + n_lpar <= 1)
+        & (n_lpar == is_rpar.sum(axis=1))
+        & signs_ok
+    )
+
+    exponents = np.where(is_digit, np.minimum(digits_right, _MAX_DIGITS), 0)
+    digit_values = np.where(is_digit, codes.astype(np.int64) - ord("0"), 0)
+    mantissa = (digit_values * 10 ** exponents).sum(axis=1)
+
+    # Pasamos a céntimos: se completan ceros o se redondea si hay más de dos decimales.
+    scale = 2 - frac
+    cents = np.where(
+        scale >= 0,
+        mantissa * 10 ** np.clip(scale, 0, None),
+        np.rint(mantissa / 10.0 ** np.clip(-scale, 0, None)).astype(np.int64),
+    )
+    cents = np.where((n_minus + n_lpar) > 0, -cents, cents)
+
+    return cents, valid
+
+
+def parse_amounts(values: pd.Series, decimal: str = None, thousands: str = None) -> pd.Series:
+    """
+    Convierte una columna de importes a céntimos (entero) de forma vectorizada.
+
+    Entiende formatos como "1.234,56 €", "-12,50", "12,50-", "(12.50)" o
+    "1,234.56 USD". Si no se indican los separadores, se detectan con
+    detect_number_format; si solo se indica uno, el otro se deduce. Los importes que no se pueden interpretar quedan
+    como <NA> en lugar de interrumpir la carga.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.Series(np.rint(values * 100), index=values.index).astype("Int64")
+
+    if decimal is None and thousands is None:
+        decimal, thousands = detect_number_format(values)
+    elif decimal is None:
+        decimal = "," if thousands == "." else "."
+    elif thousands is None:
+        thousands = "." if decimal == "," else ","
+    if decimal == thousands:
+        raise ValueError("El separador decimal y el de miles no pueden coincidir.")
+
+    cents = np.zeros(len(values), dtype=np.int64)
+    valid = np.zeros(len(values), dtype=bool)
+
+    # Procesamos por bloques para acotar la memoria de la matriz de caracteres.
+    for start in range(0, len(values), _CHUNK_ROWS):
+        block = values.iloc[start : start + _CHUNK_ROWS]
+        codes = _codepoints(block)
+        stop = start + len(block)
+        cents[start:stop], valid[start:stop] = _parse_cents_block(codes, decimal, thousands)
+
+    valid &= values.notna().to_numpy()
+    return pd.Series(pd.arrays.IntegerArray(cents, ~valid), index=values.index)
+
+
+def _read_csv_as_text(file) -> pd.DataFrame:
+    """
+    Lee un CSV (ruta o archivo abierto) con todas las columnas como texto.
+
+    El separador (coma, punto y coma...) se detecta con csv.Sniffer sobre las
+    primeras líneas, de modo que la lectura usa el motor C de pandas, que es
+    mucho más rápido y libera el GIL al cargar varios archivos en paralelo.
+    """
+    if hasattr(file, "getvalue"):
+        raw = file.getvalue()
+    elif hasattr(file, "read"):
+        raw = file.read()
+    else:
+        with open(file, "rb") as fh:
+            raw = fh.read()
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+
+    sample = raw[:64 * 1024].decode("utf-8", errors="ignore")
+    sample = sample[: sample.rfind("\n") + 1] or sample
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        sep = ","
+
+    return pd.read_csv(io.BytesIO(raw), sep=sep, dtype=str)
+
+
+def load_transactions(file, return_rejected: bool = False):
     """
     Carga un CSV de transacciones e intenta normalizar las columnas.
     Acepta nombres típicos en inglés o español para fecha, importe, descripción y categoría.
+
+    Los importes se guardan en "amount" (euros) y "amount_cents" (entero).
+    Las filas cuyo importe no se puede interpretar se descartan; con
+    return_rejected=True se devuelven aparte como (df, rechazadas).
     """
-    # sep=None + engine="python" intenta adivinar el separador (coma, punto y coma...)
-    df = pd.read_csv(file, sep=None, engine="python")
+    # Leemos todo como texto para que los importes lleguen intactos a
+    # parse_amounts ("1.500" no debe convertirse en 1.5 antes de detectar el formato).
+    df = _read_csv_as_text(file)
     df.columns = [c.strip().lower() for c in df.columns]
 
     col_map = {}
@@ -34,15 +284,13 @@ def load_transactions(file) -> pd.DataFrame:
     df["date"] = pd.to_datetime(df["date"], dayfirst=True, errors="coerce")
     df = df.dropna(subset=["date"])
 
-    # Normalizamos el importe (quitamos €, comas, espacios…)
-    df["amount"] = (
-        df["amount"]
-        .astype(str)
-        .str.replace(",", ".", regex=False)
-        .str.replace("€", "", regex=False)
-        .str.replace(" ", "", regex=False)
-        .astype(float)
-    )
+    # Normalizamos el importe (separadores según el formato detectado, €, signos…)
+    cents = parse_amounts(df["amount"])
+    invalid = cents.isna()
+    rejected = df.loc[invalid].copy()
+    df = df.loc[~invalid].copy()
+    df["amount_cents"] = cents[~invalid].astype("int64")
+    df["amount"] = df["amount_cents"] / 100
 
     if "description" not in df.columns:
         df["description"] = ""
@@ -50,6 +298,134 @@ def load_transactions(file) -> pd.DataFrame:
     if "category" not in df.columns:
         df["category"] = "Sin categoría"
 
+    if return_rejected:
+        return df, rejected
+    return df
+
+
+def _account_name(file, position: int) -> str:
+    """
+    Nombre de cuenta por defecto: el nombre del archivo sin extensión.
+    """
+    name = getattr(file, "name", file if isinstance(file, str) else None)
+    if not name:
+        return f"Cuenta {position + 1}"
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def _normalize_description(descriptions: pd.Series) -> pd.Series:
+    """
+    Normaliza descripciones para compararlas: minúsculas, sin tildes
+    y con los espacios colapsados.
+    """
+    return (
+        descriptions.fillna("")
+        .astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _factorize_normalized(descriptions: pd.Series, normalize):
+    """
+    Factoriza las descripciones aplicando normalize solo a los valores distintos.
+    Devuelve (códigos por fila, valores normalizados).
+    """
+    description_codes, uniques = pd.factorize(descriptions.fillna(""))
+    codes, normalized = pd.factorize(normalize(pd.Series(uniques, dtype=object)))
+    return codes[description_codes], normalized
+
+
+def drop_duplicate_transactions(df: pd.DataFrame, by_account: bool = True) -> pd.DataFrame:
+    """
+    Elimina los movimientos repetidos entre exportaciones que se solapan.
+
+    Dos filas son el mismo movimiento si coinciden fecha, importe y descripción
+    normalizada. Las repeticiones dentro de un mismo archivo ("source_file")
+    se consideran movimientos distintos (dos cafés el mismo día), así que solo
+    se descartan las que sobran respecto al archivo que más veces las contiene.
+    Sin columna "source_file" se asume un único archivo y no se elimina nada.
+
+    Por defecto la cuenta ("account") forma parte de la clave: solo se comparan
+    exportaciones de la misma cuenta, y el mismo cargo el mismo día en dos
+    cuentas distintas (por ejemplo, una comisión de 5 €) se conserva en ambas.
+    Con by_account=False, o sin columna "account", se compara entre todas.
+    """
+    description_codes, _ = _factorize_normalized(df["description"], _normalize_description)
+    key_columns = {
+        "date": df["date"].to_numpy(),
+        "amount_cents": df["amount_cents"].to_numpy(),
+        "description": description_codes,
+    }
+    if by_account and "account" in df.columns:
+        key_columns["account"] = df["account"].to_numpy()
+    key = pd.util.hash_pandas_object(pd.DataFrame(key_columns), index=False).to_numpy()
+
+    if "source_file" in df.columns:
+        source = df["source_file"].to_numpy()
+    else:
+        source = np.zeros(len(df), dtype=np.int64)
+
+    occurrence = pd.Series(key).groupby([key, source]).cumcount().to_numpy()
+    keep = ~pd.DataFrame({"key": key, "occurrence": occurrence}).duplicated().to_numpy()
+    return df.loc[keep].reset_index(drop=True)
+
+
+def load_many_transactions(
+    files,
+    accounts=None,
+    max_workers: int = None,
+    deduplicate: bool = True,
+    return_rejected: bool = False,
+):
+    """
+    Carga varios CSV en paralelo con load_transactions y los une en un solo DataFrame.
+
+    Cada fila se etiqueta con su cuenta ("account", por defecto el nombre del
+    archivo) y su archivo de origen ("source_file"). Con deduplicate=True se
+    eliminan los movimientos repetidos entre exportaciones solapadas de una
+    misma cuenta, así que los archivos de la misma cuenta deben compartir nombre
+    en accounts.
+    """
+    files = list(files)
+    if accounts is None:
+        accounts = [_account_name(f, i) for i, f in enumerate(files)]
+    if len(accounts) != len(files):
+        raise ValueError("Debe indicarse una cuenta por cada archivo.")
+    if not files:
+        raise ValueError("No se ha indicado ningún archivo.")
+
+    def load_one(position):
+        try:
+            return load_transactions(files[position], return_rejected=True)
+        except Exception as e:
+            raise ValueError(f"{accounts[position]}: {e}") from e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(load_one, range(len(files))))
+
+    loaded, rejected = [], []
+    for position, (df, bad_rows) in enumerate(results):
+        for frame, target in ((df, loaded), (bad_rows, rejected)):
+            frame = frame.copy()
+            frame["account"] = accounts[position]
+            frame["source_file"] = position
+            target.append(frame)
+
+    df = (
+        pd.concat(loaded, ignore_index=True)
+        .sort_values("date", kind="mergesort")
+        .reset_index(drop=True)
+    )
+    if deduplicate:
+        df = drop_duplicate_transactions(df)
+
+    if return_rejected:
+        return df, pd.concat(rejected, ignore_index=True)
     return df
 
 
@@ -78,6 +454,127 @@ def category_summary(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+# Periodicidades reconocidas: (nombre, días mínimos, días máximos, meses por periodo, apariciones mínimas)
+RECURRING_PERIODS = [
+    ("mensual", 26, 35, 1, 3),
+    ("trimestral", 84, 98, 3, 2),
+    ("anual", 350, 380, 12, 2),
+]
+
+
+def _normalize_merchant(descriptions: pd.Series) -> pd.Series:
+    """
+    Reduce la descripción al nombre del comercio quitando números, fechas
+    y referencias que cambian de un cargo a otro.
+    """
+    return (
+        _normalize_description(descriptions)
+        .str.replace(r"[^a-z ]+", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def detect_recurring_payments(
+    df: pd.DataFrame,
+    amount_tolerance: float = 0.15,
+    min_regularity: float = 0.75,
+    expenses_only: bool = True,
+) -> pd.DataFrame:
+    """
+    Detecta pagos periódicos (alquiler, suscripciones, suministros...).
+
+    Agrupa los movimientos por comercio normalizado e importe parecido (dentro
+    de amount_tolerance en términos relativos) y busca, sobre las diferencias
+    de fechas ordenadas de cada grupo, un ritmo mensual, trimestral o anual que
+    se cumpla en al menos min_regularity de los intervalos. Solo se devuelven
+    los pagos que siguen activos al final del extracto.
+    """
+    columns = [
+        "merchant", "frequency", "occurrences", "amount",
+        "monthly_amount", "first_date", "last_date",
+    ]
+    data = df.loc[df["amount"] < 0] if expenses_only else df.loc[df["amount"] != 0]
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+
+    if "amount_cents" in data.columns:
+        cents = data["amount_cents"].to_numpy(dtype=np.int64)
+    else:
+        cents = np.rint(data["amount"].to_numpy() * 100).astype(np.int64)
+
+    # Normalizamos solo las descripciones distintas, no cada fila.
+    merchant_codes, merchants = _factorize_normalized(data["description"], _normalize_merchant)
+    work = pd.DataFrame(
+        {
+            "merchant": merchant_codes,
+            "cents": cents,
+            "date": data["date"].to_numpy(),
+        }
+    )
+
+    # Agrupamos importes parecidos: dentro de cada comercio, ordenados por
+    # importe, se abre un grupo nuevo cuando el salto supera la tolerancia.
+    work = work.sort_values(["merchant", "cents"], kind="mergesort")
+    prev_cents = work["cents"].shift()
+    new_cluster = (work["merchant"] != work["merchant"].shift()) | (
+        (work["cents"] - prev_cents).abs() > amount_tolerance * prev_cents.abs()
+    )
+    work["cluster"] = new_cluster.cumsum()
+    work["size"] = work["cents"].abs()
+
+    # Intervalos entre cargos consecutivos de cada grupo.
+    work = work.sort_values(["cluster", "date"], kind="mergesort")
+    same_cluster = work["cluster"] == work["cluster"].shift()
+    work["gap"] = (work["date"] - work["date"].shift()).dt.days.where(same_cluster)
+
+    groups = work.groupby("cluster")
+    summary = pd.DataFrame(
+        {
+            "merchant": groups["merchant"].first(),
+            "occurrences": groups.size(),
+            "cents": groups["cents"].median(),
+            "spread": groups["size"].max() / groups["size"].min(),
+            "first_date": groups["date"].min(),
+            "last_date": groups["date"].max(),
+        }
+    )
+
+    # El encadenado de importes puede juntar cargos que crecen poco a poco;
+    # descartamos los grupos cuyo rango total es demasiado amplio.
+    summary = summary.loc[summary["spread"] <= (1 + amount_tolerance) ** 2]
+
+    last_ledger_date = df["date"].max()
+    detected = []
+    for name, low, high, months, min_count in RECURRING_PERIODS:
+        in_period = work["gap"].between(low, high)
+        regularity = (
+            in_period.groupby(work["cluster"]).sum().reindex(summary.index)
+            / (summary["occurrences"] - 1)
+        )
+        active = (last_ledger_date - summary["last_date"]).dt.days <= high * 1.5
+        match = (summary["occurrences"] >= min_count) & (regularity >= min_regularity) & active
+        found = summary.loc[match].copy()
+        found["frequency"] = name
+        found["amount"] = found["cents"] / 100
+        found["monthly_amount"] = found["amount"] / months
+        detected.append(found)
+        summary = summary.loc[~match]
+
+    result = pd.concat(detected)
+    result["merchant"] = merchants[result["merchant"].to_numpy()]
+    return result[columns].sort_values("monthly_amount").reset_index(drop=True)
+
+
+def recurring_monthly_total(recurring: pd.DataFrame) -> float:
+    """
+    Importe mensual equivalente de los pagos periódicos detectados, en positivo,
+    listo para usar como gastos fijos en Cashflow.
+    """
+    monthly = recurring["monthly_amount"]
+    return float(-monthly[monthly < 0].sum())
+
+
 def income_expense_summary(df: pd.DataFrame):
     """
     Devuelve (ingresos_totales, gastos_totales, saldo_neto).
@@ -0,0 +1,145 @@
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Añadimos la carpeta src/ al path para que se pueda hacer "from transactions import ..."
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+from transactions import (
+    detect_number_format,
+    detect_recurring_payments,
+    drop_duplicate_transactions,
+    load_many_transactions,
+    load_transactions,
+    parse_amounts,
+    recurring_monthly_total,
+)
+
+
+def test_detect_number_format():
+    assert detect_number_format(pd.Series(["1.234,56 €", "-12,50"])) == (",", ".")
+    assert detect_number_format(pd.Series(["1,234.56", "-0.5"])) == (".", ",")
+
+
+def test_parse_amounts_spanish_format():
+    values = pd.Series(["1.234,56 €", "-12,50", "12,50-", "(3,00)", "EUR 7", "abc", None])
+    cents = parse_amounts(values)
+    assert cents.tolist()[:5] == [123456, -1250, -1250, -300, 700]
+    assert cents.isna().tolist() == [False] * 5 + [True, True]
+
+
+def test_parse_amounts_rejects_misplaced_signs_and_overflow():
+    values = pd.Series(
+        [
+            "12-50", "2024-01", "1-1", "1(2)3", "12+", "99999999999999999",
+            "1E5", "12A34", "12 34", "- 12", "(7)", "1 234,56 €",
+        ]
+    )
+    cents = parse_amounts(values)
+    assert cents.isna().tolist() == [True] * 9 + [False] * 3
+    assert cents.tolist()[9:] == [-1200, -700, 123456]
+
+
+def test_parse_amounts_rejects_oversized_cells():
+    values = pd.Series(["12,50"] * 1000 + ["x" * 2000])
+    cents = parse_amounts(values)
+    assert cents.isna().tolist() == [False] * 1000 + [True]
+
+
+def test_parse_amounts_with_one_separator():
+    values = pd.Series(["1.234,56", "7,5"])
+    assert parse_amounts(values, thousands=".").tolist() == [123456, 750]
+    assert parse_amounts(pd.Series(["1,234.56", "7.5"]), decimal=".").tolist() == [123456, 750]
+    with pytest.raises(ValueError):
+        parse_amounts(values, decimal=",", thousands=",")
+
+
+def test_load_transactions_keeps_spanish_thousands():
+    csv = io.StringIO("fecha;importe\n01/01/2024;1.500\n02/01/2024;-20\n")
+    df = load_transactions(csv)
+    assert df["amount_cents"].tolist() == [150000, -2000]
+
+
+def test_load_transactions_reports_rejected_rows():
+    csv = io.StringIO(
+        "Fecha;Concepto;Importe\n"
+        "01/01/2024;Nómina;1.850,00 €\n"
+        "03/01/2024;Supermercado;-84,35 €\n"
+        "05/01/2024;Error;n/d\n"
+    )
+    df, rejected = load_transactions(csv, return_rejected=True)
+    assert df["amount_cents"].tolist() == [185000, -8435]
+    assert df["amount"].tolist() == [1850.0, -84.35]
+    assert rejected["description"].tolist() == ["Error"]
+
+
+def test_load_many_transactions_removes_overlapping_duplicates():
+    january = io.StringIO(
+        "date,description,amount\n"
+        "30/01/2024,Café,-1.50\n"
+        "30/01/2024,Café,-1.50\n"
+        "31/01/2024,Nómina,1850.00\n"
+    )
+    overlap = io.StringIO(
+        "date,description,amount\n"
+        "30/01/2024,CAFE ,-1.50\n"
+        "31/01/2024,Nómina,1850.00\n"
+        "01/02/2024,Alquiler,-700.00\n"
+    )
+    df = load_many_transactions([january, overlap], accounts=["banco", "banco"])
+    assert df["amount_cents"].tolist() == [-150, -150, 185000, -70000]
+    assert df["source_file"].tolist() == [0, 0, 0, 1]
+
+
+def test_load_many_transactions_keeps_charges_of_other_accounts():
+    files = [
+        io.StringIO("fecha;concepto;importe\n01/03/2024;Netflix;-12,99\n01/03/2024;Comisión;-5,00\n")
+        for _ in range(2)
+    ]
+    df = load_many_transactions(files, accounts=["cuenta nómina", "tarjeta pareja"])
+    assert len(df) == 4
+
+
+def test_load_many_transactions_reports_account_on_error():
+    broken = io.StringIO("concepto;importe\nNetflix;-12,99\n")
+    with pytest.raises(ValueError, match="^tarjeta pareja: "):
+        load_many_transactions([broken], accounts=["tarjeta pareja"])
+
+
+def test_drop_duplicate_transactions_by_account():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-03-01", "2024-03-01"]),
+            "amount_cents": [-500, -500],
+            "description": ["Comisión mantenimiento", "COMISION MANTENIMIENTO"],
+            "account": ["banco a", "banco b"],
+        }
+    )
+    # Sin source_file se asume un solo archivo y no se elimina nada.
+    assert len(drop_duplicate_transactions(df, by_account=False)) == 2
+
+    df["source_file"] = [0, 1]
+    assert len(drop_duplicate_transactions(df)) == 2
+    assert len(drop_duplicate_transactions(df, by_account=False)) == 1
+
+
+def test_detect_recurring_payments():
+    rows = []
+    for month in range(1, 13):
+        rows.append((pd.Timestamp(2024, month, 1), f"ALQUILER REF {month}", -700.0))
+        rows.append((pd.Timestamp(2024, month, 15), f"NETFLIX.COM {month:02d}/2024", -12.99))
+        rows.append((pd.Timestamp(2024, month, month + 3), "Supermercado", -(30.0 + month * 11)))
+    for month in (2, 5, 8, 11):
+        rows.append((pd.Timestamp(2024, month, 3), "Seguro hogar", -90.0))
+    df = pd.DataFrame(rows, columns=["date", "description", "amount"])
+
+    recurring = detect_recurring_payments(df)
+    assert recurring["merchant"].tolist() == ["alquiler ref", "seguro hogar", "netflix com"]
+    assert recurring["frequency"].tolist() == ["mensual", "trimestral", "mensual"]
+    assert round(recurring_monthly_total(recurring), 2) == 742.99